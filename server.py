@@ -1,18 +1,30 @@
+import base64
+import gzip
+import hashlib
+import hmac
+import itertools
 import json
+import os
+import queue
 import re
+import signal
+import socket
 import sqlite3
+import sys
 import threading
 import time
-import uuid
-from datetime import datetime, timezone
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from urllib.parse import urlparse, parse_qs
+from collections import OrderedDict
+from contextlib import contextmanager
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote_plus
 
 
 # Simple in-repo Kanban API implementing a useful subset of SPEC.md
 # - SQLite for storage
-# - Basic Bearer token handling: if token is a JWT, extract sub without signature verification;
-#   if token is a raw string, treat that string as user id. Health/version are public.
+# - Basic Bearer token handling: if token is a JWT, extract sub (the HS256 signature is checked
+#   only when JWT_SECRET is set); if token is a raw string, treat that string as user id.
+#   Health/version are public.
 
 
 DB_PATH = "./data.sqlite3"
@@ -21,38 +33,168 @@ VERSION = "1.0.0"
 
 
 ALPH = "0123456789abcdefghijklmnopqrstuvwxyz"
-A2I = {ch: i for i, ch in enumerate(ALPH)}
-I2A = {i: ch for i, ch in enumerate(ALPH)}
+# Byte-indexed tables: midpoint works on ASCII bytes, so digit lookups are
+# plain sequence indexing instead of dict hashing.
+A2I = bytes(ALPH.index(chr(b)) if chr(b) in ALPH else 0 for b in range(256))
+I2A = ALPH.encode("ascii")
 MIN = 0
 MAX = 35
 
+# Shared compact encoder: no per-call option handling, no whitespace on the wire.
+JSON_ENCODE = json.JSONEncoder(separators=(",", ":")).encode
+
+# Routes under /v1/boards, as a trie over path segments: "*" takes an id,
+# None names the route ending at a node, ":verb" names a custom action on the
+# last segment. Dispatch walks at most five dict levels, whatever the number of routes.
+BOARDS_PATH = f"{API_PREFIX}/boards"
+ROUTES = {
+    "*": {
+        None: "board",
+        ":leave": "leave",
+        "members": {None: "members"},
+        "columns": {
+            None: "columns",
+            "*": {
+                None: "column",
+                ":move": "column_move",
+                "cards": {None: "cards", "*": {None: "card"}},
+            },
+        },
+        "cards": {"*": {":move": "card_move"}},
+    },
+}
+UUID_RE = re.compile("[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def match_route(path: str) -> tuple[str | None, list[str]]:
+    if not path.startswith(BOARDS_PATH + "/"):
+        return None, []
+    segments = path[len(BOARDS_PATH) + 1 :].split("/")
+    last, _, verb = segments[-1].partition(":")
+    segments[-1] = last
+    node, params = ROUTES, []
+    for seg in segments:
+        # Literal children only; "*" and ":verb" keys are not path text.
+        child = node.get(seg) if seg[:1] not in ("*", ":") else None
+        if child is None:
+            child = node.get("*")
+            if child is None or not UUID_RE.fullmatch(seg):
+                return None, []
+            params.append(seg)
+        node = child
+    return node.get(f":{verb}" if verb else None), params
+
+
+MAX_BODY = 1024 * 1024
+# Idle keep-alive connections are dropped after this many seconds.
+KEEPALIVE_TIMEOUT = float(os.environ.get("KEEPALIVE_TIMEOUT", "15"))
+LISTEN_BACKLOG = int(os.environ.get("LISTEN_BACKLOG", "2048"))
+# Worker processes; more than one shares the port through SO_REUSEPORT.
+WORKERS = int(os.environ.get("WORKERS", "1"))
+# Idle connections kept per process; extra ones opened under a burst are closed on release.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "20"))
+# Seconds between PRAGMA optimize runs on connection checkin, per process.
+DB_OPTIMIZE_INTERVAL = float(os.environ.get("DB_OPTIMIZE_INTERVAL", "900"))
+
+# JSON bodies at least this large are gzipped for clients that accept it.
+GZIP_MIN_SIZE = 1000
+
+# Health and version payloads never change; encode them once.
+HEALTH_BODY = JSON_ENCODE({"status": "ok"}).encode("utf-8")
+VERSION_BODY = JSON_ENCODE({"version": VERSION}).encode("utf-8")
+
+
+# (second, formatted "YYYY-MM-DDTHH:MM:SS") of the last timestamp; swapped as
+# one tuple, so threads never see a mismatched pair.
+NOW_PREFIX: tuple[int, str] = (-1, "")
+
 
 def now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    # Fixed width: isoformat() drops the fraction on whole seconds, which breaks
+    # the lexical order created_at cursors rely on. The date and time part is
+    # formatted once per second; only the microseconds change between writes.
+    global NOW_PREFIX
+    s, us = divmod(time.time_ns() // 1000, 1_000_000)
+    second, prefix = NOW_PREFIX
+    if second != s:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(s))
+        NOW_PREFIX = (s, prefix)
+    return f"{prefix}.{us:06d}Z"
+
+
+# (second, b"Date: ...\r\n") for prebuilt responses, formatted once per second
+# and swapped as one tuple like NOW_PREFIX.
+DATE_HEADER: tuple[int, bytes] = (-1, b"")
+
+
+def date_header() -> bytes:
+    global DATE_HEADER
+    now = int(time.time())
+    second, header = DATE_HEADER
+    if second != now:
+        header = f"Date: {formatdate(now, usegmt=True)}\r\n".encode("ascii")
+        DATE_HEADER = (now, header)
+    return header
 
 
 def gen_uuid() -> str:
-    return str(uuid.uuid4())
+    # UUIDv7 (RFC 9562): 48-bit Unix milliseconds up front, so new ids append to
+    # the primary-key B-trees instead of landing on random pages.
+    # Formatted straight from the random bytes, no UUID object round trip.
+    ms = time.time_ns() // 1_000_000
+    r = os.urandom(10)
+    h = f"{ms:012x}{(r[0] & 0x0F) | 0x70:02x}{r[1]:02x}{(r[2] & 0x3F) | 0x80:02x}{r[3:].hex()}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 
 def midpoint(left: str | None, right: str | None) -> str:
-    L = left or ""
-    R = right or ""
+    L = (left or "").encode("ascii")
+    R = (right or "").encode("ascii")
+    nl, nr = len(L), len(R)
     i = 0
-    out = []
+    out = bytearray()
     while True:
-        l = A2I[L[i]] if i < len(L) else MIN
-        r = A2I[R[i]] if i < len(R) else MAX
+        l = A2I[L[i]] if i < nl else MIN
+        r = A2I[R[i]] if i < nr else MAX
         if l + 1 < r:
-            mid = (l + r) // 2
-            out.append(I2A[mid])
-            return "".join(out)
+            out.append(I2A[(l + r) // 2])
+            return out.decode("ascii")
         out.append(I2A[l])
         i += 1
 
 
+def anchor_keys(
+    conn: sqlite3.Connection, table: str, scope: str, params: tuple, after_id: str | None, before_id: str | None
+) -> tuple[str | None, str | None]:
+    # Sort keys of both anchors in one lookup; an anchor outside the scope reads as absent.
+    if not after_id and not before_id:
+        return None, None
+    cur = conn.execute(f"SELECT id, sort_key FROM {table} WHERE id IN (?, ?) AND {scope}", (after_id, before_id, *params))
+    keys = dict(cur.fetchall())
+    return keys.get(after_id), keys.get(before_id)
+
+
+def neighbour_keys(
+    conn: sqlite3.Connection, table: str, scope: str, params: tuple, left: str | None, right: str | None, exclude_id: str = ""
+) -> tuple[str | None, str | None]:
+    # With one anchor (or none) the open side is the actual sibling next to it,
+    # not infinity, so the new key lands right beside the anchor (or at the end)
+    # and never equals a sibling's key. Call inside the write transaction.
+    base = f"FROM {table} WHERE {scope} AND id != ?"
+    if right is None:
+        if left is None:
+            left = conn.execute(f"SELECT MAX(sort_key) {base}", (*params, exclude_id)).fetchone()[0]
+        else:
+            right = conn.execute(f"SELECT MIN(sort_key) {base} AND sort_key > ?", (*params, exclude_id, left)).fetchone()[0]
+    elif left is None:
+        left = conn.execute(f"SELECT MAX(sort_key) {base} AND sort_key < ?", (*params, exclude_id, right)).fetchone()[0]
+    return left, right
+
+
 def ensure_db():
     conn = sqlite3.connect(DB_PATH)
+    # WAL is persistent in the database file: readers stop blocking the writer.
+    conn.execute("PRAGMA journal_mode = WAL;")
     conn.execute("PRAGMA foreign_keys = ON;")
     conn.executescript(
         """
@@ -63,7 +205,9 @@ def ensure_db():
           owner TEXT NOT NULL,
           created_at TEXT NOT NULL,
           updated_at TEXT NOT NULL,
-          version INTEGER NOT NULL
+          version INTEGER NOT NULL,
+          rev INTEGER NOT NULL DEFAULT 0,
+          members_count INTEGER NOT NULL DEFAULT 0
         );
         CREATE TABLE IF NOT EXISTS board_memberships (
           board_id TEXT NOT NULL,
@@ -99,203 +243,798 @@ def ensure_db():
           FOREIGN KEY(board_id) REFERENCES boards(id) ON DELETE CASCADE,
           FOREIGN KEY(column_id) REFERENCES columns(id) ON DELETE CASCADE
         );
+        -- Board view: filter + full ORDER BY (sort_key, created_at, id) served
+        -- straight from the index, no temp B-tree sort.
+        CREATE INDEX IF NOT EXISTS idx_columns_board_order ON columns(board_id, sort_key, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_cards_board_order ON cards(board_id, sort_key, created_at, id);
+        -- Anchor and neighbour lookups within one column.
+        CREATE INDEX IF NOT EXISTS idx_cards_board_column_sort ON cards(board_id, column_id, sort_key);
+        -- ON DELETE CASCADE from columns finds a column's cards by column_id alone.
+        CREATE INDEX IF NOT EXISTS idx_cards_column ON cards(column_id);
+        -- A user's boards: owned ones and active memberships, each an index range
+        -- instead of a walk over every board.
+        CREATE INDEX IF NOT EXISTS idx_boards_owner ON boards(owner, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_memberships_user ON board_memberships(user_id, status, board_id, role);
+        -- Role checks read only (board_id, user_id, status, role): index-only lookup.
+        CREATE INDEX IF NOT EXISTS idx_memberships_lookup ON board_memberships(board_id, user_id, status, role);
+        """
+    )
+    # Databases created before boards.rev / boards.members_count existed.
+    board_columns = {r[1] for r in conn.execute("PRAGMA table_info(boards)")}
+    if "rev" not in board_columns:
+        conn.execute("ALTER TABLE boards ADD COLUMN rev INTEGER NOT NULL DEFAULT 0")
+    if "members_count" not in board_columns:
+        conn.execute("ALTER TABLE boards ADD COLUMN members_count INTEGER NOT NULL DEFAULT 0")
+        conn.execute(
+            "UPDATE boards SET members_count ="
+            " (SELECT COUNT(*) FROM board_memberships WHERE board_id = boards.id AND status = 'active')"
+        )
+    # boards.rev bumps on any write to the board's columns, cards or memberships,
+    # so the board view's ETag is read from the board row alone.
+    conn.executescript(
+        "".join(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_rev AFTER {event} ON {table}
+            BEGIN
+              UPDATE boards SET rev = rev + 1 WHERE id = {ref}.board_id;
+            END;
+            """
+            for table in ("columns", "cards", "board_memberships")
+            for event, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD"))
+        )
+    )
+    # boards.members_count tracks active memberships (the owner is not one), so
+    # listings and the board view read the count instead of counting per row.
+    conn.executescript(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_board_memberships_insert_count AFTER INSERT ON board_memberships
+        WHEN NEW.status = 'active'
+        BEGIN
+          UPDATE boards SET members_count = members_count + 1 WHERE id = NEW.board_id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_board_memberships_delete_count AFTER DELETE ON board_memberships
+        WHEN OLD.status = 'active'
+        BEGIN
+          UPDATE boards SET members_count = members_count - 1 WHERE id = OLD.board_id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_board_memberships_status_count AFTER UPDATE OF status ON board_memberships
+        WHEN OLD.status != NEW.status
+        BEGIN
+          UPDATE boards SET members_count = members_count + (NEW.status = 'active') - (OLD.status = 'active')
+          WHERE id = NEW.board_id;
+        END;
         """
     )
+    # Refresh planner statistics at startup; the row limit keeps this to a few
+    # milliseconds however large the tables grow.
+    conn.execute("PRAGMA analysis_limit = 400;")
+    conn.execute("ANALYZE;")
     conn.commit()
     conn.close()
 
 
+# Connections are reused across requests instead of opened and closed per call.
+# A LIFO stack: the connection released last, with the warmest page and
+# statement caches, is handed out first, and surplus ones sit idle at the bottom.
+# list.pop() and list.append() are atomic, so no lock is needed.
+CONN_POOL: list[sqlite3.Connection] = []
+NEXT_OPTIMIZE = time.monotonic() + DB_OPTIMIZE_INTERVAL
+
+
+def connect_db() -> sqlite3.Connection:
+    # Hot statements are module constants, so the per-connection statement
+    # cache keys on the same string objects every request; size it to hold them all.
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    # Per connection in SQLite: without it deleting a column or board leaves its
+    # cards (and columns, memberships) behind.
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA cache_size = -20000;")
+    conn.execute("PRAGMA mmap_size = 268435456;")
+    # Bounds the ANALYZE work PRAGMA optimize may do on checkin.
+    conn.execute("PRAGMA analysis_limit = 400;")
+    return conn
+
+
+def acquire_conn() -> sqlite3.Connection:
+    try:
+        return CONN_POOL.pop()
+    except IndexError:
+        return connect_db()
+
+
+def release_conn(conn: sqlite3.Connection):
+    global NEXT_OPTIMIZE
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        # Pooled connections live for the life of the process; refresh planner
+        # statistics now and then instead of only at startup. This runs after the
+        # response has been written.
+        if time.monotonic() >= NEXT_OPTIMIZE:
+            NEXT_OPTIMIZE = time.monotonic() + DB_OPTIMIZE_INTERVAL
+            conn.execute("PRAGMA optimize;")
+    except sqlite3.Error:
+        # A connection that cannot roll back is not handed to the next request.
+        conn.close()
+        return
+    if len(CONN_POOL) >= DB_POOL_SIZE:
+        conn.close()
+        return
+    CONN_POOL.append(conn)
+
+
+@contextmanager
+def get_conn():
+    conn = acquire_conn()
+    try:
+        yield conn
+    finally:
+        release_conn(conn)
+
+
+def prewarm_pool(n: int):
+    # Open connections up front so the first requests skip connect and pragmas.
+    for _ in range(n):
+        CONN_POOL.append(connect_db())
+
+
+# Error request ids: a random per-process prefix plus a counter, laid out like
+# a UUID. Unique without a getrandom() call per error; re-seeded in forked workers.
+def reset_request_ids():
+    global REQUEST_ID_PREFIX, REQUEST_ID_COUNTER
+    r = os.urandom(8).hex()
+    REQUEST_ID_PREFIX = f"{r[:8]}-{r[8:12]}-{r[12:16]}-"
+    REQUEST_ID_COUNTER = itertools.count()
+
+
+reset_request_ids()
+os.register_at_fork(after_in_child=reset_request_ids)
+
+
+def next_request_id() -> str:
+    n = next(REQUEST_ID_COUNTER)
+    return f"{REQUEST_ID_PREFIX}{(n >> 48) & 0xFFFF:04x}-{n & 0xFFFFFFFFFFFF:012x}"
+
+
 def json_error(code: int, message: str, details: dict | None = None, request_id: str | None = None):
     return {
         "error": {
             "code": code,
             "message": message,
             "details": details or {},
-            "requestId": request_id or gen_uuid(),
+            "requestId": request_id or next_request_id(),
         }
     }
 
 
-def parse_bearer(auth_header: str | None) -> str | None:
-    if not auth_header:
+def prebuilt_error(code: int, message: str) -> tuple[bytes, bytes]:
+    # Error body encoded once, split around the requestId value; a response
+    # only splices a fresh id in between.
+    head, _, tail = JSON_ENCODE(json_error(code, message, request_id="@")).partition('"@"')
+    return f'{head}"'.encode("utf-8"), f'"{tail}'.encode("utf-8")
+
+
+NOT_FOUND_ERROR = prebuilt_error(404, "not_found")
+UNAUTHORIZED_ERROR = prebuilt_error(401, "unauthorized")
+FORBIDDEN_ERROR = prebuilt_error(403, "forbidden")
+PRECONDITION_FAILED_ERROR = prebuilt_error(412, "precondition_failed")
+
+
+# Decoded JWT claims (LRU + TTL), keyed by a 128-bit blake2b fingerprint of the
+# token instead of the token itself, which can run to kilobytes. Misses are
+# cached too, so a replayed bad token does not get re-parsed every time.
+# Entries hold (sub, exp, cached_until); a hit only has to re-check exp.
+TOKEN_CACHE_SIZE = 10_000
+TOKEN_CACHE_TTL = 300.0
+TOKEN_CACHE: OrderedDict = OrderedDict()
+TOKEN_CACHE_LOCK = threading.Lock()
+
+
+JWT_SECRET = os.environ.get("JWT_SECRET", "").encode("utf-8")
+# Parsed once into an immutable tuple. When HS256 is the only accepted
+# algorithm the JOSE header need not be decoded at all: a matching HMAC over
+# the signing input already authenticates the token.
+JWT_ALGORITHMS = tuple(a.strip() for a in os.environ.get("JWT_ALGORITHMS", "HS256").split(",") if a.strip())
+JWT_HS256_ONLY = JWT_ALGORITHMS == ("HS256",)
+
+
+def b64url_json(segment: str):
+    return json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+
+
+def query_param(query: str, name: str) -> str | None:
+    # First non-empty value of one parameter, without decoding the whole query
+    # string into a dict of lists.
+    prefix = name + "="
+    for pair in query.split("&"):
+        if pair.startswith(prefix):
+            value = pair[len(prefix) :]
+            if "%" in value or "+" in value:
+                value = unquote_plus(value)
+            if value:
+                return value
+    return None
+
+
+def encode_cursor(created_at: str, board_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}|{board_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str] | None:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except ValueError:
+        return None
+    created_at, sep, board_id = raw.rpartition("|")
+    if not sep or not created_at or not board_id:
         return None
-    if not auth_header.lower().startswith("bearer "):
+    return created_at, board_id
+
+
+def verify_hs256(token: str, secret: bytes, check_alg: bool = True) -> dict | None:
+    # Split once, HMAC the signing input, constant-time compare; claims are
+    # only parsed after the signature checks out.
+    header_b64, _, rest = token.partition(".")
+    payload_b64, _, signature_b64 = rest.partition(".")
+    if not signature_b64:
         return None
-    token = auth_header.split(" ", 1)[1].strip()
+    if check_alg and b64url_json(header_b64).get("alg") != "HS256":
+        return None
+    expected = hmac.new(secret, f"{header_b64}.{payload_b64}".encode("ascii"), hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, base64.urlsafe_b64decode(signature_b64 + "=" * (-len(signature_b64) % 4))):
+        return None
+    return b64url_json(payload_b64)
+
+
+def jwt_claims(token: str) -> tuple[str | None, float | None]:
+    try:
+        if JWT_SECRET:
+            if "HS256" not in JWT_ALGORITHMS:
+                return None, None
+            data = verify_hs256(token, JWT_SECRET, check_alg=not JWT_HS256_ONLY)
+            if data is None:
+                return None, None
+        else:
+            # Best-effort parse JWT payload without signature verification.
+            parts = token.split(".")
+            if len(parts) != 3:
+                return None, None
+            data = b64url_json(parts[1])
+        exp = data.get("exp")
+        if not isinstance(exp, (int, float)):
+            exp = None
+        return data.get("sub"), exp
+    except Exception:
+        return None, None
+
+
+def parse_bearer(auth_header: str | None) -> str | None:
+    # The scheme is case-insensitive; lowercase only its seven characters, not the token.
+    if not auth_header or auth_header[:7].lower() != "bearer ":
+        return None
+    token = auth_header[7:].strip()
     # Accept raw user id tokens for local/dev
     if token and "." not in token:
         return token
-    # Best-effort parse JWT payload without signature verification.
-    try:
-        parts = token.split(".")
-        if len(parts) != 3:
-            return None
-        payload_b64 = parts[1] + "=="
-        import base64
-
-        data = json.loads(base64.urlsafe_b64decode(payload_b64.encode("utf-8")).decode("utf-8"))
-        sub = data.get("sub")
-        return sub
-    except Exception:
+    key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    now = time.monotonic()
+    with TOKEN_CACHE_LOCK:
+        hit = TOKEN_CACHE.get(key)
+        if hit is not None and hit[2] > now:
+            TOKEN_CACHE.move_to_end(key)
+        else:
+            hit = None
+    if hit is None:
+        sub, exp = jwt_claims(token)
+        hit = (sub, exp, now + TOKEN_CACHE_TTL)
+        with TOKEN_CACHE_LOCK:
+            TOKEN_CACHE[key] = hit
+            TOKEN_CACHE.move_to_end(key)
+            if len(TOKEN_CACHE) > TOKEN_CACHE_SIZE:
+                TOKEN_CACHE.popitem(last=False)
+    sub, exp, _ = hit
+    if exp is not None and exp <= time.time():
         return None
+    return sub
+
+
+# Hot lookups share one SQL string each, so every call site hits the same
+# prepared statement in the connection's statement cache.
+# Owner check and membership probe in one statement: no row means no board.
+# SQLite prefers the unique primary key for the membership side, which still
+# has to read the table row; pin the covering index so the probe never leaves it.
+ROLE_SQL = """
+    SELECT CASE WHEN b.owner=? THEN 'admin' ELSE m.role END
+    FROM boards b
+    LEFT JOIN board_memberships m INDEXED BY idx_memberships_lookup
+      ON m.board_id=b.id AND m.user_id=? AND m.status='active'
+    WHERE b.id=?
+"""
+# Board row plus the caller's role; the members count is kept on the row by trigger.
+BOARD_VIEW_SQL = """
+    SELECT b.*,
+           CASE WHEN b.owner=? THEN 'admin' ELSE (
+               SELECT role FROM board_memberships INDEXED BY idx_memberships_lookup
+               WHERE board_id=b.id AND user_id=? AND status='active'
+           ) END as myRole,
+           b.members_count + 1 as membersCount
+    FROM boards b
+    WHERE b.id=?
+"""
+LIST_BOARDS_SQL = """
+    SELECT b.id, b.name, b.description, b.owner, b.created_at, b.updated_at,
+           COALESCE(m.role, CASE WHEN b.owner=? THEN 'admin' END) as myRole,
+           b.members_count + 1 as membersCount
+    FROM boards b
+    LEFT JOIN board_memberships m ON m.board_id=b.id AND m.user_id=? AND m.status='active'
+    WHERE b.id IN (
+        SELECT id FROM boards WHERE owner = ?
+        UNION ALL
+        SELECT board_id FROM board_memberships WHERE user_id = ? AND status = 'active'
+    ) AND (b.created_at, b.id) < (?, ?)
+    ORDER BY b.created_at DESC, b.id DESC
+    LIMIT ?
+"""
+BOARD_COLUMNS_SQL = (
+    "SELECT id, name, sort_key, created_at, updated_at FROM columns"
+    " WHERE board_id = ? ORDER BY sort_key ASC, created_at ASC, id ASC"
+)
+BOARD_CARDS_SQL = (
+    "SELECT id, column_id, title, description, sort_key, created_at, updated_at, version FROM cards"
+    " WHERE board_id = ? ORDER BY sort_key ASC, created_at ASC, id ASC"
+)
+INSERT_CARD_SQL = """
+    INSERT INTO cards(id,board_id,column_id,title,description,sort_key,created_at,updated_at,version)
+    VALUES (?,?,?,?,?,?,?, ?, 1)
+"""
+# Card columns in encode_card() order, for RETURNING clauses that feed a response.
+CARD_FIELDS = "id, board_id, column_id, title, description, sort_key, created_at, updated_at, version"
+MOVE_CARD_SQL = (
+    "UPDATE cards SET column_id=?, sort_key=?, updated_at=?, version=version+1"
+    f" WHERE id=? AND version=? RETURNING {CARD_FIELDS}"
+)
+
+
+# A card response has a fixed shape, so it is formatted straight into JSON text
+# instead of built as a dict and walked by the encoder. Ids, sort keys and
+# timestamps never need escaping; title and description go through the
+# encoder's own string escaper.
+CARD_TEMPLATE = (
+    '{"id":"%s","boardId":"%s","columnId":"%s","title":%s,"description":%s,'
+    '"sortKey":"%s","createdAt":"%s","updatedAt":"%s","version":%d}'
+)
+JSON_STRING = json.encoder.encode_basestring_ascii
+
+
+def encode_card(row: tuple | sqlite3.Row) -> bytes:
+    # A CARD_FIELDS row, unpacked positionally.
+    kid, board_id, column_id, title, description, sort_key, created_at, updated_at, version = row
+    description = "null" if description is None else JSON_STRING(description)
+    return (
+        CARD_TEMPLATE
+        % (kid, board_id, column_id, JSON_STRING(title), description, sort_key, created_at, updated_at, version)
+    ).encode("ascii")
+
+
+def board_view_etag(b: sqlite3.Row) -> str:
+    # version covers the board row, rev (trigger-maintained) everything under
+    # it; the role is per caller.
+    return f'W/"{b["version"]}-{b["rev"]}-{b["myRole"]}"'
+
+
+# Encoded board-view bodies (LRU), plain and gzipped, keyed by board id and view
+# ETag. Any write under the board bumps version or rev, which changes the key, so
+# entries never go stale; superseded ones just age out.
+BOARD_VIEW_CACHE_SIZE = 128
+BOARD_VIEW_CACHE: OrderedDict = OrderedDict()
+BOARD_VIEW_CACHE_LOCK = threading.Lock()
+
+
+def board_view_cache_get(key: tuple) -> tuple[bytes, bytes | None] | None:
+    with BOARD_VIEW_CACHE_LOCK:
+        data = BOARD_VIEW_CACHE.get(key)
+        if data is not None:
+            BOARD_VIEW_CACHE.move_to_end(key)
+        return data
+
+
+def board_view_cache_put(key: tuple, data: bytes, gzipped: bytes | None):
+    with BOARD_VIEW_CACHE_LOCK:
+        BOARD_VIEW_CACHE[key] = (data, gzipped)
+        BOARD_VIEW_CACHE.move_to_end(key)
+        if len(BOARD_VIEW_CACHE) > BOARD_VIEW_CACHE_SIZE:
+            BOARD_VIEW_CACHE.popitem(last=False)
+
+
+def if_match_version(if_match: str | None) -> int | None:
+    # The version an If-Match header names: the quoted ETag ("3"), a bare
+    # version (3), or the board view's W/"3-<rev>-<role>" as GET returned it.
+    if if_match is None:
+        return None
+    weak = if_match.startswith("W/")
+    if weak:
+        if_match = if_match[2:]
+    if if_match.startswith('"') and if_match.endswith('"'):
+        if_match = if_match[1:-1]
+    if weak:
+        if_match = if_match.partition("-")[0]
+    if not (if_match.isascii() and if_match.isdigit()):
+        return None
+    return int(if_match)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored.
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == opaque for t in if_none_match.split(","))
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    # RFC 9110 12.5.3: gzip (or *) with a non-zero qvalue; "gzip;q=0" refuses it.
+    if not accept_encoding:
+        return False
+    star = False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "x-gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding != "*":
+            return q > 0
+        star = q > 0
+    return star
 
 
 def role_for_user(conn: sqlite3.Connection, board_id: str, user_id: str | None) -> str | None:
     if user_id is None:
         return None
-    cur = conn.execute(
-        "SELECT owner FROM boards WHERE id = ?",
-        (board_id,),
-    )
-    row = cur.fetchone()
-    if not row:
-        return None
-    if row[0] == user_id:
-        return "admin"
-    cur = conn.execute(
-        "SELECT role FROM board_memberships WHERE board_id = ? AND user_id = ? AND status = 'active'",
-        (board_id, user_id),
-    )
+    cur = conn.execute(ROLE_SQL, (user_id, user_id, board_id))
     r = cur.fetchone()
     return r[0] if r else None
 
 
+# Roles that satisfy each minimum role, built once; a check is one set lookup.
+ROLES_AT_LEAST = {
+    "reader": frozenset({"reader", "writer", "admin"}),
+    "writer": frozenset({"writer", "admin"}),
+    "admin": frozenset({"admin"}),
+}
+
+
 def require_member(role: str | None, min_role: str) -> bool:
-    order = {"reader": 1, "writer": 2, "admin": 3}
-    if role is None:
-        return False
-    return order.get(role, 0) >= order.get(min_role, 0)
+    return role in ROLES_AT_LEAST[min_role]
+
+
+# DELETE routes: table, key columns in route-param order, and minimum role.
+DELETE_TARGETS = {
+    "board": ("boards", "id=?", "admin"),
+    "column": ("columns", "board_id=? AND id=?", "writer"),
+    "card": ("cards", "board_id=? AND column_id=? AND id=?", "writer"),
+}
+# Per route, the role check and If-Match ride on the DELETE itself (params:
+# route params, version, user, user, board), so a success is one statement.
+# A miss runs the second one (params: user, user, board, route params) to tell
+# 403 from 404 from 412.
+DELETE_SQL = {
+    route: (
+        f"DELETE FROM {table} WHERE {key} AND version=?"
+        f" AND ({ROLE_SQL}) IN ({', '.join(repr(r) for r in sorted(ROLES_AT_LEAST[min_role]))})"
+        " RETURNING 1",
+        f"SELECT ({ROLE_SQL}), EXISTS(SELECT 1 FROM {table} WHERE {key})",
+        min_role,
+    )
+    for route, (table, key, min_role) in DELETE_TARGETS.items()
+}
+
+
+# Access-log lines are queued by request threads and written in batches by a
+# background thread, so a slow stderr never blocks a response.
+LOG_QUEUE: queue.SimpleQueue = queue.SimpleQueue()
+
+
+def log_writer():
+    while True:
+        lines = [LOG_QUEUE.get()]
+        time.sleep(0.05)
+        while True:
+            try:
+                lines.append(LOG_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        sys.stderr.write("".join(lines))
+        sys.stderr.flush()
 
 
 class Handler(BaseHTTPRequestHandler):
     server_version = "TodoService/1.0"
+    # HTTP/1.1 keeps connections open between requests; every response must
+    # therefore carry Content-Length (or be bodiless) and leave no request
+    # body unread on the socket.
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
+    # Responses still written in more than one piece (stock send_error) must
+    # not wait on Nagle for the client's delayed ACK.
+    disable_nagle_algorithm = True
+    body_read = True
+
+    def handle_one_request(self):
+        # The public probes (GET /v1/health, /v1/version over HTTP/1.1) are
+        # recognised from the buffered request line and answered without
+        # parse_request() or the email-style header parser; everything else
+        # takes the stock path.
+        try:
+            head = self.rfile.peek(PROBE_LINE_MAX)
+            response = PROBE_RESPONSES.get(head[: head.find(b"\n") + 1])
+            if response is None:
+                return super().handle_one_request()
+            self.raw_requestline = self.rfile.readline(PROBE_LINE_MAX)
+            self.requestline = self.raw_requestline.decode("latin-1").rstrip("\r\n")
+            self.command, self.path, self.request_version = self.requestline.split()
+            self.close_connection = not self.skip_probe_headers()
+            self.log_request(200)
+            self.write_prebuilt(response)
+        except TimeoutError as e:
+            self.log_error("Request timed out: %r", e)
+            self.close_connection = True
+
+    def skip_probe_headers(self) -> bool:
+        # Consume the header block without building a Message. Only a
+        # Connection: close or a body matter for the next request; returns
+        # whether the connection may stay open.
+        keep_alive = True
+        length = 0
+        for _ in range(100):
+            line = self.rfile.readline(65537)
+            if line in (b"\r\n", b"\n", b""):
+                keep_alive = keep_alive and line != b""
+                break
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"connection" and b"close" in value.lower():
+                keep_alive = False
+            elif name == b"content-length":
+                try:
+                    length = int(value)
+                except ValueError:
+                    keep_alive = False
+            elif name == b"transfer-encoding":
+                keep_alive = False
+        else:
+            keep_alive = False
+        if keep_alive and length:
+            if length < 0 or length > MAX_BODY:
+                return False
+            self.rfile.read(length)
+        return keep_alive
+
+    def parse_request(self):
+        self.body_read = True
+        ok = super().parse_request()
+        if ok:
+            self.body_read = False
+        return ok
+
+    def discard_body(self) -> bool:
+        # An unread body would be parsed as the next request on this connection.
+        # Swallow it, or report that the connection has to be closed instead.
+        if self.body_read:
+            return True
+        self.body_read = True
+        # Chunked bodies are not decoded here; a negative length would block
+        # read() until the client hangs up.
+        if "Transfer-Encoding" in self.headers:
+            return False
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            return False
+        if length < 0 or length > MAX_BODY:
+            return False
+        if length:
+            self.rfile.read(length)
+        return True
+
+    def send_response(self, code, message=None):
+        keep_alive = self.discard_body()
+        super().send_response(code, message)
+        if not keep_alive:
+            self.send_header("Connection", "close")
+
+    def log_message(self, format, *args):
+        LOG_QUEUE.put(f"{self.address_string()} - - [{self.log_date_time_string()}] {format % args}\n")
 
     # Utilities
     def send_json(self, status: int, body: dict, headers: dict | None = None):
-        data = json.dumps(body).encode("utf-8")
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Content-Length", str(len(data)))
+        self.send_bytes(status, JSON_ENCODE(body).encode("utf-8"), headers)
+
+    def send_bytes(self, status: int, data: bytes, headers: dict | None = None, gzipped: bytes | None = None):
+        # gzipped: data already compressed by the caller, used as is.
+        compressed = len(data) >= GZIP_MIN_SIZE and accepts_gzip(self.headers.get("Accept-Encoding"))
+        if compressed:
+            data = gzipped if gzipped is not None else gzip.compress(data, compresslevel=6)
+        keep_alive = self.discard_body()
+        self.log_request(status)
+        # Status line and headers formatted in one string instead of one
+        # send_header() call per line, and sent with the body in one write.
+        head = (
+            f"{self.protocol_version} {status} {self.responses[status][0]}\r\n"
+            f"Server: {self.version_string()}\r\n"
+            f"Date: {self.date_time_string()}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+        )
+        if compressed:
+            head += "Content-Encoding: gzip\r\nVary: Accept-Encoding\r\n"
         if headers:
-            for k, v in headers.items():
-                self.send_header(k, v)
-        self.end_headers()
-        self.wfile.write(data)
+            head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        if not keep_alive:
+            self.close_connection = True
+        if self.close_connection:
+            head += "Connection: close\r\n"
+        self.wfile.write(head.encode("latin-1") + b"\r\n" + data)
+
+    def send_error_body(self, status: int, error: tuple[bytes, bytes]):
+        head, tail = error
+        self.send_bytes(status, head + next_request_id().encode("ascii") + tail)
+
+    def send_prebuilt(self, response: tuple[bytes, bytes], status: int = 200):
+        if not self.discard_body():
+            self.close_connection = True
+        self.log_request(status)
+        self.write_prebuilt(response)
+
+    def write_prebuilt(self, response: tuple[bytes, bytes]):
+        # Status line, headers and body already fused around the per-request
+        # Date and Connection lines: one write, one syscall.
+        head, tail = response
+        close = b"Connection: close\r\n" if self.close_connection else b""
+        self.wfile.write(head + date_header() + close + tail)
 
     def read_json(self):
-        length = int(self.headers.get("Content-Length", "0"))
-        if length > 1024 * 1024:
+        # Neither is read here; body_read stays False, so the error response
+        # closes the connection instead of parsing the body as a request.
+        if "Transfer-Encoding" in self.headers:
+            return None, json_error(400, "content-length required")
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            length = -1
+        if length < 0:
+            return None, json_error(400, "invalid content-length")
+        if length > MAX_BODY:
             return None, json_error(400, "payload too large")
+        self.body_read = True
         raw = self.rfile.read(length) if length else b""
         if not raw:
             return {}, None
         try:
-            return json.loads(raw.decode("utf-8")), None
+            body = json.loads(raw.decode("utf-8"))
         except Exception:
             return None, json_error(400, "invalid_json")
+        # Every body is an object; handlers rely on body.get().
+        if type(body) is not dict:
+            return None, json_error(400, "invalid_json")
+        return body, None
 
     def do_GET(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
+        path, _, query = self.path.partition("?")
         if path == f"{API_PREFIX}/health":
-            return self.send_json(200, {"status": "ok"})
+            return self.send_prebuilt(HEALTH_RESPONSE)
         if path == f"{API_PREFIX}/version":
-            return self.send_json(200, {"version": VERSION})
+            return self.send_prebuilt(VERSION_RESPONSE)
 
         # Auth
         user_id = parse_bearer(self.headers.get("Authorization"))
         if user_id is None:
-            return self.send_json(401, json_error(401, "unauthorized"))
+            return self.send_error_body(401, UNAUTHORIZED_ERROR)
 
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        try:
+        route, params = match_route(path)
+        with get_conn() as conn:
             # GET /v1/boards
-            if path == f"{API_PREFIX}/boards":
-                q = parse_qs(parsed.query)
-                limit = int(q.get("limit", [50])[0])
-                limit = max(1, min(200, limit))
-                cur = conn.execute(
-                    """
-                    SELECT b.*, 
-                           COALESCE((SELECT role FROM board_memberships m WHERE m.board_id=b.id AND m.user_id=? AND m.status='active'),
-                                    CASE WHEN b.owner=? THEN 'admin' END) as myRole,
-                           (SELECT COUNT(*) FROM board_memberships m2 WHERE m2.board_id=b.id AND m2.status='active') + 1 as membersCount
-                    FROM boards b
-                    WHERE b.owner = ? OR EXISTS (
-                        SELECT 1 FROM board_memberships m WHERE m.board_id=b.id AND m.user_id=? AND m.status='active'
-                    )
-                    ORDER BY b.created_at DESC
-                    LIMIT ?
-                    """,
-                    (user_id, user_id, user_id, user_id, limit),
+            if path == BOARDS_PATH:
+                limit = query_param(query, "limit")
+                try:
+                    limit = max(1, min(200, int(limit))) if limit else 50
+                except ValueError:
+                    return self.send_json(422, json_error(422, "validation_error", {"limit": "invalid"}))
+                # Keyset pagination: resume after the last (created_at, id) seen
+                after = ("\U0010ffff", "")
+                cursor = query_param(query, "cursor")
+                if cursor:
+                    after = decode_cursor(cursor)
+                    if after is None:
+                        return self.send_json(422, json_error(422, "validation_error", {"cursor": "invalid"}))
+                # Plain tuples in SELECT order, unpacked straight into the output dicts.
+                cur = conn.cursor()
+                cur.row_factory = None
+                cur.execute(
+                    LIST_BOARDS_SQL,
+                    (user_id, user_id, user_id, user_id, after[0], after[1], limit + 1),
                 )
-                boards = []
-                for r in cur.fetchall():
-                    boards.append(
-                        {
-                            "id": r["id"],
-                            "name": r["name"],
-                            "description": r["description"],
-                            "owner": r["owner"],
-                            "createdAt": r["created_at"],
-                            "updatedAt": r["updated_at"],
-                            "myRole": r["myRole"] or "reader",
-                            "membersCount": r["membersCount"] or 1,
-                        }
-                    )
-                return self.send_json(200, {"boards": boards, "nextCursor": None})
+                rows = cur.fetchall()
+                next_cursor = None
+                if len(rows) > limit:
+                    rows = rows[:limit]
+                    next_cursor = encode_cursor(rows[-1][4], rows[-1][0])
+                boards = [
+                    {
+                        "id": bid,
+                        "name": name,
+                        "description": description,
+                        "owner": owner,
+                        "createdAt": created_at,
+                        "updatedAt": updated_at,
+                        "myRole": my_role or "reader",
+                        "membersCount": members_count or 1,
+                    }
+                    for bid, name, description, owner, created_at, updated_at, my_role, members_count in rows
+                ]
+                return self.send_json(200, {"boards": boards, "nextCursor": next_cursor})
 
             # GET /v1/boards/{boardId}
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)", path)
-            if m:
-                board_id = m.group(1)
-                role = role_for_user(conn, board_id, user_id)
-                if not require_member(role, "reader"):
-                    return self.send_json(404, json_error(404, "not_found"))
-                cur = conn.execute("SELECT * FROM boards WHERE id=?", (board_id,))
+            if route == "board":
+                board_id = params[0]
+                # Board row, caller's role and members count in one statement
+                cur = conn.execute(BOARD_VIEW_SQL, (user_id, user_id, board_id))
                 b = cur.fetchone()
-                if not b:
-                    return self.send_json(404, json_error(404, "not_found"))
-                cur = conn.execute(
-                    "SELECT * FROM columns WHERE board_id = ? ORDER BY sort_key ASC, created_at ASC, id ASC",
-                    (board_id,),
-                )
+                if not b or not require_member(b["myRole"], "reader"):
+                    return self.send_error_body(404, NOT_FOUND_ERROR)
+                etag = board_view_etag(b)
+                if etag_matches(self.headers.get("If-None-Match"), etag):
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                cache_key = (board_id, etag)
+                cached = board_view_cache_get(cache_key)
+                if cached is not None:
+                    return self.send_bytes(200, cached[0], headers={"ETag": etag}, gzipped=cached[1])
+                # Only the fields the view emits, as plain tuples unpacked straight
+                # into the output dicts; boardId is the path parameter.
+                cur = conn.cursor()
+                cur.row_factory = None
+                cur.execute(BOARD_COLUMNS_SQL, (board_id,))
                 columns = [
                     {
-                        "id": c["id"],
-                        "boardId": c["board_id"],
-                        "name": c["name"],
-                        "sortKey": c["sort_key"],
-                        "createdAt": c["created_at"],
-                        "updatedAt": c["updated_at"],
+                        "id": cid,
+                        "boardId": board_id,
+                        "name": name,
+                        "sortKey": sort_key,
+                        "createdAt": created_at,
+                        "updatedAt": updated_at,
                     }
-                    for c in cur.fetchall()
+                    for cid, name, sort_key, created_at, updated_at in cur.fetchall()
                 ]
-                cur = conn.execute(
-                    "SELECT * FROM cards WHERE board_id = ? ORDER BY sort_key ASC, created_at ASC, id ASC",
-                    (board_id,),
-                )
+                cur.execute(BOARD_CARDS_SQL, (board_id,))
                 cards = [
                     {
-                        "id": r["id"],
-                        "boardId": r["board_id"],
-                        "columnId": r["column_id"],
-                        "title": r["title"],
-                        "description": r["description"],
-                        "sortKey": r["sort_key"],
-                        "createdAt": r["created_at"],
-                        "updatedAt": r["updated_at"],
-                        "version": r["version"],
+                        "id": kid,
+                        "boardId": board_id,
+                        "columnId": column_id,
+                        "title": title,
+                        "description": description,
+                        "sortKey": sort_key,
+                        "createdAt": created_at,
+                        "updatedAt": updated_at,
+                        "version": version,
                     }
-                    for r in cur.fetchall()
+                    for kid, column_id, title, description, sort_key, created_at, updated_at, version in cur.fetchall()
                 ]
-                # myRole and membersCount
-                cur = conn.execute(
-                    "SELECT COUNT(*) FROM board_memberships WHERE board_id=? AND status='active'",
-                    (board_id,),
-                )
-                members_count = cur.fetchone()[0] + 1
                 body = {
                     "board": {
                         "id": b["id"],
@@ -304,62 +1043,63 @@ class Handler(BaseHTTPRequestHandler):
                         "owner": b["owner"],
                         "createdAt": b["created_at"],
                         "updatedAt": b["updated_at"],
-                        "myRole": role,
-                        "membersCount": members_count,
+                        "myRole": b["myRole"],
+                        "membersCount": b["membersCount"],
                     },
                     "columns": columns,
                     "cards": cards,
                 }
-                return self.send_json(200, body)
+                data = JSON_ENCODE(body).encode("utf-8")
+                # Compressed once per fill, not on every hit.
+                gzipped = gzip.compress(data, compresslevel=6) if len(data) >= GZIP_MIN_SIZE else None
+                board_view_cache_put(cache_key, data, gzipped)
+                return self.send_bytes(200, data, headers={"ETag": etag}, gzipped=gzipped)
 
             # GET /v1/boards/{boardId}/members
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)/members", path)
-            if m:
-                board_id = m.group(1)
+            if route == "members":
+                board_id = params[0]
                 role = role_for_user(conn, board_id, user_id)
                 if not require_member(role, "reader"):
-                    return self.send_json(404, json_error(404, "not_found"))
-                cur = conn.execute(
+                    return self.send_error_body(404, NOT_FOUND_ERROR)
+                # Plain tuples: no sqlite3.Row per member, no per-field name lookups.
+                cur = conn.cursor()
+                cur.row_factory = None
+                cur.execute(
                     "SELECT user_id, role, status, invited_by, created_at, updated_at FROM board_memberships WHERE board_id=?",
                     (board_id,),
                 )
-                members = []
-                for r in cur.fetchall():
-                    members.append(
-                        {
-                            "boardId": board_id,
-                            "userId": r["user_id"],
-                            "role": r["role"],
-                            "status": r["status"],
-                            "invitedBy": r["invited_by"],
-                            "createdAt": r["created_at"],
-                            "updatedAt": r["updated_at"],
-                            "user": {"id": r["user_id"], "displayName": r["user_id"], "avatarUrl": None},
-                        }
-                    )
+                members = [
+                    {
+                        "boardId": board_id,
+                        "userId": uid,
+                        "role": mrole,
+                        "status": status,
+                        "invitedBy": invited_by,
+                        "createdAt": created_at,
+                        "updatedAt": updated_at,
+                        "user": {"id": uid, "displayName": uid, "avatarUrl": None},
+                    }
+                    for uid, mrole, status, invited_by, created_at, updated_at in cur.fetchall()
+                ]
                 return self.send_json(200, {"members": members})
 
-            return self.send_json(404, json_error(404, "not_found"))
-        finally:
-            conn.close()
+            return self.send_error_body(404, NOT_FOUND_ERROR)
 
     def do_POST(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
+        path = self.path.partition("?")[0]
         if path == f"{API_PREFIX}/health" or path == f"{API_PREFIX}/version":
             return self.send_json(405, json_error(405, "method_not_allowed"))
 
         user_id = parse_bearer(self.headers.get("Authorization"))
         if user_id is None:
-            return self.send_json(401, json_error(401, "unauthorized"))
+            return self.send_error_body(401, UNAUTHORIZED_ERROR)
         body, err = self.read_json()
         if err:
             return self.send_json(400, err)
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        try:
+        route, params = match_route(path)
+        with get_conn() as conn:
             # POST /v1/boards
-            if path == f"{API_PREFIX}/boards":
+            if path == BOARDS_PATH:
                 name = (body.get("name") or "").strip()
                 if len(name) == 0 or len(name) > 140:
                     return self.send_json(422, json_error(422, "validation_error", {"name": "1..140"}))
@@ -389,27 +1129,23 @@ class Handler(BaseHTTPRequestHandler):
                 )
 
             # POST /v1/boards/{boardId}/columns
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)/columns", path)
-            if m and self.command == "POST":
-                board_id = m.group(1)
+            if route == "columns" and self.command == "POST":
+                board_id = params[0]
                 role = role_for_user(conn, board_id, user_id)
                 if not require_member(role, "writer"):
-                    return self.send_json(403, json_error(403, "forbidden"))
+                    return self.send_error_body(403, FORBIDDEN_ERROR)
                 name = (body.get("name") or "").strip()
                 if len(name) == 0 or len(name) > 80:
                     return self.send_json(422, json_error(422, "validation_error", {"name": "1..80"}))
                 before_id = body.get("beforeColumnId")
                 after_id = body.get("afterColumnId")
-                # Fetch anchors in order (same board)
-                def get_key(cid):
-                    if not cid:
-                        return None
-                    cur = conn.execute("SELECT sort_key FROM columns WHERE id=? AND board_id=?", (cid, board_id))
-                    r = cur.fetchone()
-                    return r[0] if r else None
-
-                left_key = get_key(after_id)
-                right_key = get_key(before_id)
+                # Anchor reads and the insert share one write transaction, so no
+                # concurrent writer can take the same gap.
+                conn.execute("BEGIN IMMEDIATE")
+                left_key, right_key = neighbour_keys(
+                    conn, "columns", "board_id=?", (board_id,),
+                    *anchor_keys(conn, "columns", "board_id=?", (board_id,), after_id, before_id),
+                )
                 sort_key = midpoint(left_key, right_key)
                 col_id = gen_uuid()
                 now = now_iso()
@@ -431,17 +1167,16 @@ class Handler(BaseHTTPRequestHandler):
                 )
 
             # POST /v1/boards/{boardId}/columns/{columnId}/cards
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)/columns/([0-9a-f-]+)/cards", path)
-            if m:
-                board_id, column_id = m.group(1), m.group(2)
+            if route == "cards":
+                board_id, column_id = params
                 role = role_for_user(conn, board_id, user_id)
                 if not require_member(role, "writer"):
-                    return self.send_json(403, json_error(403, "forbidden"))
+                    return self.send_error_body(403, FORBIDDEN_ERROR)
                 # Verify column belongs to board
                 cur = conn.execute("SELECT id, sort_key FROM columns WHERE id=? AND board_id=?", (column_id, board_id))
                 col = cur.fetchone()
                 if not col:
-                    return self.send_json(404, json_error(404, "not_found"))
+                    return self.send_error_body(404, NOT_FOUND_ERROR)
                 title = (body.get("title") or "").strip()
                 if len(title) == 0 or len(title) > 200:
                     return self.send_json(422, json_error(422, "validation_error", {"title": "1..200"}))
@@ -450,127 +1185,88 @@ class Handler(BaseHTTPRequestHandler):
                     return self.send_json(422, json_error(422, "validation_error", {"description": "0..8000"}))
                 before_id = body.get("beforeCardId")
                 after_id = body.get("afterCardId")
-                def get_card_key(cid):
-                    if not cid:
-                        return None
-                    cur = conn.execute(
-                        "SELECT sort_key FROM cards WHERE id=? AND board_id=? AND column_id=?",
-                        (cid, board_id, column_id),
-                    )
-                    r = cur.fetchone()
-                    return r[0] if r else None
-
-                left_key = get_card_key(after_id)
-                right_key = get_card_key(before_id)
+                conn.execute("BEGIN IMMEDIATE")
+                left_key, right_key = neighbour_keys(
+                    conn, "cards", "board_id=? AND column_id=?", (board_id, column_id),
+                    *anchor_keys(conn, "cards", "board_id=? AND column_id=?", (board_id, column_id), after_id, before_id),
+                )
                 sort_key = midpoint(left_key, right_key)
                 card_id = gen_uuid()
                 now = now_iso()
                 conn.execute(
-                    """
-                    INSERT INTO cards(id,board_id,column_id,title,description,sort_key,created_at,updated_at,version)
-                    VALUES (?,?,?,?,?,?,?, ?, 1)
-                    """,
+                    INSERT_CARD_SQL,
                     (card_id, board_id, column_id, title, description, sort_key, now, now),
                 )
                 conn.commit()
-                return self.send_json(
-                    201,
-                    {
-                        "id": card_id,
-                        "boardId": board_id,
-                        "columnId": column_id,
-                        "title": title,
-                        "description": description,
-                        "sortKey": sort_key,
-                        "createdAt": now,
-                        "updatedAt": now,
-                        "version": 1,
-                    },
+                return self.send_bytes(
+                    201, encode_card((card_id, board_id, column_id, title, description, sort_key, now, now, 1))
                 )
 
             # POST /v1/boards/{boardId}/cards/{cardId}:move
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)/cards/([0-9a-f-]+):move", path)
-            if m:
-                board_id, card_id = m.group(1), m.group(2)
+            if route == "card_move":
+                board_id, card_id = params
                 role = role_for_user(conn, board_id, user_id)
                 if not require_member(role, "writer"):
-                    return self.send_json(403, json_error(403, "forbidden"))
-                cur = conn.execute("SELECT * FROM cards WHERE id=?", (card_id,))
+                    return self.send_error_body(403, FORBIDDEN_ERROR)
+                # Version check, anchor reads and the update in one write transaction.
+                conn.execute("BEGIN IMMEDIATE")
+                # The card and whether the target column is on its board, in one read
+                cur = conn.execute(
+                    """
+                    SELECT c.board_id, c.column_id, c.version,
+                           EXISTS(SELECT 1 FROM columns WHERE id=COALESCE(?, c.column_id) AND board_id=c.board_id) as targetOk
+                    FROM cards c WHERE c.id=?
+                    """,
+                    (body.get("toColumnId") or None, card_id),
+                )
                 card = cur.fetchone()
                 if not card:
-                    return self.send_json(404, json_error(404, "not_found"))
+                    return self.send_error_body(404, NOT_FOUND_ERROR)
                 if card["board_id"] != board_id:
                     return self.send_json(409, json_error(409, "invalid_move", {"reason": "cross_board"}))
-                to_column_id = body.get("toColumnId") or card["column_id"]
-                # Ensure to_column belongs to same board
-                cur = conn.execute("SELECT id FROM columns WHERE id=? AND board_id=?", (to_column_id, board_id))
-                if not cur.fetchone():
+                if not card["targetOk"]:
                     return self.send_json(422, json_error(422, "invalid_move", {"toColumnId": "not_in_board"}))
+                to_column_id = body.get("toColumnId") or card["column_id"]
                 before_id = body.get("beforeCardId")
                 after_id = body.get("afterCardId")
                 expected_version = body.get("expectedVersion")
                 if expected_version is None or int(expected_version) != int(card["version"]):
-                    return self.send_json(412, json_error(412, "precondition_failed"))
-
-                def get_key(cid):
-                    if not cid:
-                        return None
-                    cur = conn.execute(
-                        "SELECT sort_key FROM cards WHERE id=? AND board_id=? AND column_id=?",
-                        (cid, board_id, to_column_id),
-                    )
-                    r = cur.fetchone()
-                    return r[0] if r else None
+                    return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
 
-                left_key = get_key(after_id)
-                right_key = get_key(before_id)
+                left_key, right_key = neighbour_keys(
+                    conn, "cards", "board_id=? AND column_id=?", (board_id, to_column_id),
+                    *anchor_keys(conn, "cards", "board_id=? AND column_id=?", (board_id, to_column_id), after_id, before_id),
+                    card_id,
+                )
                 new_key = midpoint(left_key, right_key)
                 now = now_iso()
-                conn.execute(
-                    "UPDATE cards SET column_id=?, sort_key=?, updated_at=?, version=version+1 WHERE id=?",
-                    (to_column_id, new_key, now, card_id),
+                cur = conn.execute(
+                    MOVE_CARD_SQL,
+                    (to_column_id, new_key, now, card_id, card["version"]),
                 )
-                conn.commit()
-                cur = conn.execute("SELECT * FROM cards WHERE id=?", (card_id,))
                 c = cur.fetchone()
-                body = {
-                    "id": c["id"],
-                    "boardId": c["board_id"],
-                    "columnId": c["column_id"],
-                    "title": c["title"],
-                    "description": c["description"],
-                    "sortKey": c["sort_key"],
-                    "createdAt": c["created_at"],
-                    "updatedAt": c["updated_at"],
-                    "version": c["version"],
-                }
-                return self.send_json(200, body)
+                if c is None:
+                    return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
+                conn.commit()
+                return self.send_bytes(200, encode_card(c))
 
             # POST /v1/boards/{boardId}/columns/{columnId}:move
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)/columns/([0-9a-f-]+):move", path)
-            if m:
-                board_id, column_id = m.group(1), m.group(2)
+            if route == "column_move":
+                board_id, column_id = params
                 role = role_for_user(conn, board_id, user_id)
                 if not require_member(role, "writer"):
-                    return self.send_json(403, json_error(403, "forbidden"))
-                cur = conn.execute("SELECT * FROM columns WHERE id=? AND board_id=?", (column_id, board_id))
+                    return self.send_error_body(403, FORBIDDEN_ERROR)
+                conn.execute("BEGIN IMMEDIATE")
+                cur = conn.execute("SELECT name, created_at FROM columns WHERE id=? AND board_id=?", (column_id, board_id))
                 col = cur.fetchone()
                 if not col:
-                    return self.send_json(404, json_error(404, "not_found"))
+                    return self.send_error_body(404, NOT_FOUND_ERROR)
                 before_id = body.get("beforeColumnId")
                 after_id = body.get("afterColumnId")
-                def get_key(cid):
-                    if not cid:
-                        return None
-                    cur = conn.execute(
-                        "SELECT sort_key FROM columns WHERE id=? AND board_id=?",
-                        (cid, board_id),
-                    )
-                    r = cur.fetchone()
-                    return r[0] if r else None
-
-                left_key = get_key(after_id)
-                right_key = get_key(before_id)
+                left_key, right_key = neighbour_keys(
+                    conn, "columns", "board_id=?", (board_id,),
+                    *anchor_keys(conn, "columns", "board_id=?", (board_id,), after_id, before_id), column_id,
+                )
                 new_key = midpoint(left_key, right_key)
                 now = now_iso()
                 conn.execute(
@@ -579,8 +1275,8 @@ class Handler(BaseHTTPRequestHandler):
                 )
                 conn.commit()
                 return self.send_json(200, {
-                    "id": col["id"],
-                    "boardId": col["board_id"],
+                    "id": column_id,
+                    "boardId": board_id,
                     "name": col["name"],
                     "sortKey": new_key,
                     "createdAt": col["created_at"],
@@ -588,71 +1284,68 @@ class Handler(BaseHTTPRequestHandler):
                 })
 
             # POST /v1/boards/{boardId}:leave
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+):leave", path)
-            if m:
-                board_id = m.group(1)
+            if route == "leave":
+                board_id = params[0]
                 role = role_for_user(conn, board_id, user_id)
                 if role is None:
-                    return self.send_json(404, json_error(404, "not_found"))
+                    return self.send_error_body(404, NOT_FOUND_ERROR)
+                # The last-admin check and the delete must see the same memberships.
+                conn.execute("BEGIN IMMEDIATE")
                 if role == "admin":
-                    # Check there is another admin
+                    # Check there is another admin; existence is enough, no need to count them all
                     cur = conn.execute(
-                        "SELECT COUNT(*) FROM board_memberships WHERE board_id=? AND role='admin' AND status='active'",
+                        "SELECT 1 FROM board_memberships WHERE board_id=? AND role='admin' AND status='active' LIMIT 1",
                         (board_id,),
                     )
-                    admin_count = cur.fetchone()[0]
-                    if admin_count == 0:
+                    if cur.fetchone() is None:
                         return self.send_json(409, json_error(409, "last_admin_required"))
                 conn.execute(
                     "DELETE FROM board_memberships WHERE board_id=? AND user_id=?",
                     (board_id, user_id),
                 )
                 conn.commit()
-                return self.send_json(204, {})
+                return self.send_prebuilt(NO_CONTENT_RESPONSE, 204)
 
-            return self.send_json(404, json_error(404, "not_found"))
-        finally:
-            conn.close()
+            return self.send_error_body(404, NOT_FOUND_ERROR)
 
     def do_PATCH(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
+        path = self.path.partition("?")[0]
         user_id = parse_bearer(self.headers.get("Authorization"))
         if user_id is None:
-            return self.send_json(401, json_error(401, "unauthorized"))
+            return self.send_error_body(401, UNAUTHORIZED_ERROR)
         body, err = self.read_json()
         if err:
             return self.send_json(400, err)
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        try:
+        route, params = match_route(path)
+        # Every PATCH/DELETE route is version-guarded: without a usable If-Match
+        # the answer is 412 whatever the database holds, so don't ask it.
+        version = if_match_version(self.headers.get("If-Match"))
+        if version is None and route in ("board", "column", "card"):
+            return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
+        with get_conn() as conn:
             # PATCH /v1/boards/{boardId}
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)", path)
-            if m:
-                board_id = m.group(1)
-                role = role_for_user(conn, board_id, user_id)
-                if not require_member(role, "writer"):
-                    return self.send_json(403, json_error(403, "forbidden"))
-                cur = conn.execute("SELECT * FROM boards WHERE id=?", (board_id,))
+            if route == "board":
+                board_id = params[0]
+                # If-Match check and update in one write transaction.
+                conn.execute("BEGIN IMMEDIATE")
+                cur = conn.execute(BOARD_VIEW_SQL, (user_id, user_id, board_id))
                 b = cur.fetchone()
-                if not b:
-                    return self.send_json(404, json_error(404, "not_found"))
-                if_match = self.headers.get("If-Match")
-                if if_match is None or if_match.strip('"') != str(b["version"]):
-                    return self.send_json(412, json_error(412, "precondition_failed"))
+                if not b or not require_member(b["myRole"], "writer"):
+                    return self.send_error_body(403, FORBIDDEN_ERROR)
+                if b["version"] != version:
+                    return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
                 name = body.get("name", b["name"])
                 description = body.get("description", b["description"])
                 name = (name or "").strip()
                 if len(name) == 0 or len(name) > 140:
                     return self.send_json(422, json_error(422, "validation_error", {"name": "1..140"}))
                 now = now_iso()
-                conn.execute(
-                    "UPDATE boards SET name=?, description=?, updated_at=?, version=version+1 WHERE id=?",
+                cur = conn.execute(
+                    "UPDATE boards SET name=?, description=?, updated_at=?, version=version+1 WHERE id=? RETURNING *",
                     (name, description, now, board_id),
                 )
-                conn.commit()
-                cur = conn.execute("SELECT * FROM boards WHERE id=?", (board_id,))
                 nb = cur.fetchone()
+                conn.commit()
                 return self.send_json(200, {
                     "id": nb["id"],
                     "name": nb["name"],
@@ -660,35 +1353,45 @@ class Handler(BaseHTTPRequestHandler):
                     "owner": nb["owner"],
                     "createdAt": nb["created_at"],
                     "updatedAt": nb["updated_at"],
-                    "myRole": role,
-                    "membersCount": 1 + conn.execute("SELECT COUNT(*) FROM board_memberships WHERE board_id=? AND status='active'", (board_id,)).fetchone()[0],
+                    "myRole": b["myRole"],
+                    "membersCount": b["membersCount"],
                 }, headers={"ETag": f'"{nb["version"]}"'})
 
             # PATCH /v1/boards/{boardId}/columns/{columnId}
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)/columns/([0-9a-f-]+)", path)
-            if m:
-                board_id, column_id = m.group(1), m.group(2)
+            if route == "column":
+                board_id, column_id = params
                 role = role_for_user(conn, board_id, user_id)
                 if not require_member(role, "writer"):
-                    return self.send_json(403, json_error(403, "forbidden"))
-                cur = conn.execute("SELECT * FROM columns WHERE id=? AND board_id=?", (column_id, board_id))
-                col = cur.fetchone()
-                if not col:
-                    return self.send_json(404, json_error(404, "not_found"))
-                if_match = self.headers.get("If-Match")
-                if if_match is None or if_match.strip('"') != str(col["version"]):
-                    return self.send_json(412, json_error(412, "precondition_failed"))
-                name = (body.get("name") or col["name"]).strip()
+                    return self.send_error_body(403, FORBIDDEN_ERROR)
+                name = body.get("name")
+                conn.execute("BEGIN IMMEDIATE")
+                # Read the row to fill in an omitted name, and to answer 404 or 412
+                # ahead of 422 for an invalid one; a valid name goes straight to the
+                # UPDATE, which carries the version check.
+                if not name or not 0 < len(name.strip()) <= 80:
+                    cur = conn.execute("SELECT name, version FROM columns WHERE id=? AND board_id=?", (column_id, board_id))
+                    col = cur.fetchone()
+                    if not col:
+                        return self.send_error_body(404, NOT_FOUND_ERROR)
+                    if col["version"] != version:
+                        return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
+                    name = name or col["name"]
+                name = name.strip()
                 if len(name) == 0 or len(name) > 80:
                     return self.send_json(422, json_error(422, "validation_error", {"name": "1..80"}))
                 now = now_iso()
-                conn.execute(
-                    "UPDATE columns SET name=?, updated_at=?, version=version+1 WHERE id=?",
-                    (name, now, column_id),
+                cur = conn.execute(
+                    "UPDATE columns SET name=?, updated_at=?, version=version+1"
+                    " WHERE id=? AND board_id=? AND version=? RETURNING *",
+                    (name, now, column_id, board_id, version),
                 )
-                conn.commit()
-                cur = conn.execute("SELECT * FROM columns WHERE id=?", (column_id,))
                 col = cur.fetchone()
+                if col is None:
+                    cur = conn.execute("SELECT 1 FROM columns WHERE id=? AND board_id=?", (column_id, board_id))
+                    if cur.fetchone() is None:
+                        return self.send_error_body(404, NOT_FOUND_ERROR)
+                    return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
+                conn.commit()
                 return self.send_json(200, {
                     "id": col["id"],
                     "boardId": col["board_id"],
@@ -699,128 +1402,167 @@ class Handler(BaseHTTPRequestHandler):
                 }, headers={"ETag": f'"{col["version"]}"'})
 
             # PATCH /v1/boards/{boardId}/columns/{columnId}/cards/{cardId}
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)/columns/([0-9a-f-]+)/cards/([0-9a-f-]+)", path)
-            if m:
-                board_id, column_id, card_id = m.group(1), m.group(2), m.group(3)
+            if route == "card":
+                board_id, column_id, card_id = params
                 role = role_for_user(conn, board_id, user_id)
                 if not require_member(role, "writer"):
-                    return self.send_json(403, json_error(403, "forbidden"))
-                cur = conn.execute("SELECT * FROM cards WHERE id=? AND board_id=? AND column_id=?", (card_id, board_id, column_id))
-                card = cur.fetchone()
-                if not card:
-                    return self.send_json(404, json_error(404, "not_found"))
-                if_match = self.headers.get("If-Match")
-                if if_match is None or if_match.strip('"') != str(card["version"]):
-                    return self.send_json(412, json_error(412, "precondition_failed"))
-                title = (body.get("title") or card["title"]).strip()
+                    return self.send_error_body(403, FORBIDDEN_ERROR)
+                title = body.get("title")
+                description = body.get("description")
+                conn.execute("BEGIN IMMEDIATE")
+                # The current row is needed to fill in fields the body leaves out, and
+                # to answer 404 or 412 ahead of 422 for an invalid body; a complete,
+                # valid body goes straight to the UPDATE, which carries the version check.
+                if (
+                    not title
+                    or "description" not in body
+                    or not 0 < len(title.strip()) <= 200
+                    or (description is not None and len(description) > 8000)
+                ):
+                    cur = conn.execute(
+                        "SELECT title, description, version FROM cards WHERE id=? AND board_id=? AND column_id=?",
+                        (card_id, board_id, column_id),
+                    )
+                    card = cur.fetchone()
+                    if not card:
+                        return self.send_error_body(404, NOT_FOUND_ERROR)
+                    if card["version"] != version:
+                        return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
+                    title = title or card["title"]
+                    if "description" not in body:
+                        description = card["description"]
+                title = title.strip()
                 if len(title) == 0 or len(title) > 200:
                     return self.send_json(422, json_error(422, "validation_error", {"title": "1..200"}))
-                description = body.get("description") if "description" in body else card["description"]
                 if description is not None and len(description) > 8000:
                     return self.send_json(422, json_error(422, "validation_error", {"description": "0..8000"}))
                 now = now_iso()
-                conn.execute(
-                    "UPDATE cards SET title=?, description=?, updated_at=?, version=version+1 WHERE id=?",
-                    (title, description, now, card_id),
+                cur = conn.execute(
+                    "UPDATE cards SET title=?, description=?, updated_at=?, version=version+1"
+                    f" WHERE id=? AND board_id=? AND column_id=? AND version=? RETURNING {CARD_FIELDS}",
+                    (title, description, now, card_id, board_id, column_id, version),
                 )
-                conn.commit()
-                cur = conn.execute("SELECT * FROM cards WHERE id=?", (card_id,))
                 c = cur.fetchone()
-                return self.send_json(200, {
-                    "id": c["id"],
-                    "boardId": c["board_id"],
-                    "columnId": c["column_id"],
-                    "title": c["title"],
-                    "description": c["description"],
-                    "sortKey": c["sort_key"],
-                    "createdAt": c["created_at"],
-                    "updatedAt": c["updated_at"],
-                    "version": c["version"],
-                }, headers={"ETag": f'"{c["version"]}"'})
-
-            return self.send_json(404, json_error(404, "not_found"))
-        finally:
-            conn.close()
+                if c is None:
+                    # No row: either no such card or a stale If-Match.
+                    cur = conn.execute(
+                        "SELECT 1 FROM cards WHERE id=? AND board_id=? AND column_id=?", (card_id, board_id, column_id)
+                    )
+                    if cur.fetchone() is None:
+                        return self.send_error_body(404, NOT_FOUND_ERROR)
+                    return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
+                conn.commit()
+                return self.send_bytes(200, encode_card(c), headers={"ETag": f'"{c["version"]}"'})
+
+            return self.send_error_body(404, NOT_FOUND_ERROR)
 
     def do_DELETE(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
+        path = self.path.partition("?")[0]
         user_id = parse_bearer(self.headers.get("Authorization"))
         if user_id is None:
-            return self.send_json(401, json_error(401, "unauthorized"))
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        try:
+            return self.send_error_body(401, UNAUTHORIZED_ERROR)
+        route, params = match_route(path)
+        # Every PATCH/DELETE route is version-guarded: without a usable If-Match
+        # the answer is 412 whatever the database holds, so don't ask it.
+        version = if_match_version(self.headers.get("If-Match"))
+        if version is None and route in ("board", "column", "card"):
+            return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
+        if route not in DELETE_SQL:
+            return self.send_error_body(404, NOT_FOUND_ERROR)
+        delete_sql, miss_sql, min_role = DELETE_SQL[route]
+        board_id = params[0]
+        with get_conn() as conn:
             # DELETE /v1/boards/{boardId}
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)", path)
-            if m:
-                board_id = m.group(1)
-                role = role_for_user(conn, board_id, user_id)
-                if not require_member(role, "admin"):
-                    return self.send_json(403, json_error(403, "forbidden"))
-                cur = conn.execute("SELECT version FROM boards WHERE id=?", (board_id,))
-                r = cur.fetchone()
-                if not r:
-                    return self.send_json(404, json_error(404, "not_found"))
-                if_match = self.headers.get("If-Match")
-                if if_match is None or if_match.strip('"') != str(r["version"]):
-                    return self.send_json(412, json_error(412, "precondition_failed"))
-                conn.execute("DELETE FROM boards WHERE id=?", (board_id,))
-                conn.commit()
-                self.send_response(204)
-                self.end_headers()
-                return
-
             # DELETE /v1/boards/{boardId}/columns/{columnId}
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)/columns/([0-9a-f-]+)", path)
-            if m:
-                board_id, column_id = m.group(1), m.group(2)
-                role = role_for_user(conn, board_id, user_id)
-                if not require_member(role, "writer"):
-                    return self.send_json(403, json_error(403, "forbidden"))
-                cur = conn.execute("SELECT version FROM columns WHERE id=? AND board_id=?", (column_id, board_id))
-                col = cur.fetchone()
-                if not col:
-                    return self.send_json(404, json_error(404, "not_found"))
-                if_match = self.headers.get("If-Match")
-                if if_match is None or if_match.strip('"') != str(col["version"]):
-                    return self.send_json(412, json_error(412, "precondition_failed"))
-                conn.execute("DELETE FROM columns WHERE id=?", (column_id,))
-                conn.commit()
-                self.send_response(204)
-                self.end_headers()
-                return
-
             # DELETE /v1/boards/{boardId}/columns/{columnId}/cards/{cardId}
-            m = re.fullmatch(fr"{API_PREFIX}/boards/([0-9a-f-]+)/columns/([0-9a-f-]+)/cards/([0-9a-f-]+)", path)
-            if m:
-                board_id, column_id, card_id = m.group(1), m.group(2), m.group(3)
-                role = role_for_user(conn, board_id, user_id)
-                if not require_member(role, "writer"):
-                    return self.send_json(403, json_error(403, "forbidden"))
-                cur = conn.execute("SELECT version FROM cards WHERE id=? AND board_id=? AND column_id=?", (card_id, board_id, column_id))
-                c = cur.fetchone()
-                if not c:
-                    return self.send_json(404, json_error(404, "not_found"))
-                if_match = self.headers.get("If-Match")
-                if if_match is None or if_match.strip('"') != str(c["version"]):
-                    return self.send_json(412, json_error(412, "precondition_failed"))
-                conn.execute("DELETE FROM cards WHERE id=?", (card_id,))
-                conn.commit()
-                self.send_response(204)
-                self.end_headers()
-                return
+            if conn.execute(delete_sql, (*params, version, user_id, user_id, board_id)).fetchone() is None:
+                role, exists = conn.execute(miss_sql, (user_id, user_id, board_id, *params)).fetchone()
+                if not require_member(role, min_role):
+                    return self.send_error_body(403, FORBIDDEN_ERROR)
+                if not exists:
+                    return self.send_error_body(404, NOT_FOUND_ERROR)
+                return self.send_error_body(412, PRECONDITION_FAILED_ERROR)
+            conn.commit()
+            return self.send_prebuilt(NO_CONTENT_RESPONSE, 204)
+
+
+def prebuilt_response(body: bytes) -> tuple[bytes, bytes]:
+    # Split where write_prebuilt() splices in Date and, when closing, Connection.
+    head = (
+        f"{Handler.protocol_version} 200 OK\r\n"
+        f"Server: {Handler.server_version} {Handler.sys_version}\r\n"
+    )
+    tail = (
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1"), tail.encode("latin-1") + body
+
+
+HEALTH_RESPONSE = prebuilt_response(HEALTH_BODY)
+# 204 carries no body, so no Content-Type or Content-Length either.
+NO_CONTENT_RESPONSE = (
+    f"{Handler.protocol_version} 204 No Content\r\n"
+    f"Server: {Handler.server_version} {Handler.sys_version}\r\n".encode("latin-1"),
+    b"\r\n",
+)
+VERSION_RESPONSE = prebuilt_response(VERSION_BODY)
+PROBE_RESPONSES = {
+    f"GET {API_PREFIX}/health HTTP/1.1\r\n".encode("ascii"): HEALTH_RESPONSE,
+    f"GET {API_PREFIX}/version HTTP/1.1\r\n".encode("ascii"): VERSION_RESPONSE,
+}
+PROBE_LINE_MAX = max(len(line) for line in PROBE_RESPONSES)
 
-            return self.send_json(404, json_error(404, "not_found"))
-        finally:
-            conn.close()
+
+class Server(ThreadingHTTPServer):
+    request_queue_size = LISTEN_BACKLOG
+
+    def server_bind(self):
+        # Every worker binds its own listening socket and the kernel spreads
+        # incoming connections across them.
+        if WORKERS > 1:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def serve(host: str, port: int):
+    threading.Thread(target=log_writer, name="access-log", daemon=True).start()
+    # After any fork: SQLite connections must not cross process boundaries.
+    prewarm_pool(min(DB_POOL_SIZE, 2 * (os.cpu_count() or 1)))
+    # One thread per connection: a slow client or a long SQLite write no longer
+    # stalls every other request behind it.
+    httpd = Server((host, port), Handler)
+    print(f"Listening on {host}:{port} (pid {os.getpid()})")
+    httpd.serve_forever()
 
 
 def run(host="0.0.0.0", port=8000):
     ensure_db()
-    httpd = HTTPServer((host, port), Handler)
-    print(f"Listening on {host}:{port}")
-    httpd.serve_forever()
+    # Threads share one GIL; separate processes give real multi-core scaling.
+    children = []
+    for _ in range(WORKERS - 1):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                serve(host, port)
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    if children:
+        def stop(signum, frame):
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            for pid in children:
+                os.waitpid(pid, 0)
+            sys.exit(0)
+
+        signal.signal(signal.SIGTERM, stop)
+    serve(host, port)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,227 @@
+import gzip
+import http.client
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+HTTPD = None
+WORK = None
+
+
+def setUpModule():
+    global HTTPD, WORK
+    WORK = tempfile.TemporaryDirectory()
+    server.DB_PATH = os.path.join(WORK.name, "test.sqlite3")
+    server.ensure_db()
+    HTTPD = server.Server(("127.0.0.1", 0), server.Handler)
+    threading.Thread(target=HTTPD.serve_forever, daemon=True).start()
+
+
+def tearDownModule():
+    HTTPD.shutdown()
+    HTTPD.server_close()
+    while server.CONN_POOL:
+        server.CONN_POOL.pop().close()
+    WORK.cleanup()
+
+
+def request(method, path, body=None, user="alice", headers=None):
+    h = dict(headers or {})
+    if user:
+        h["Authorization"] = f"Bearer {user}"
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    conn = http.client.HTTPConnection("127.0.0.1", HTTPD.server_port, timeout=5)
+    try:
+        conn.request(method, path, body=data, headers=h)
+        r = conn.getresponse()
+        payload = r.read()
+        if r.getheader("Content-Encoding") == "gzip":
+            payload = gzip.decompress(payload)
+        return r.status, json.loads(payload) if payload else None, r
+    finally:
+        conn.close()
+
+
+def exchange(payload: bytes, wait: float = 2.0) -> tuple[bytes, bool]:
+    # Raw bytes in, everything the server sends back out, and whether it closed
+    # the connection before the wait ran out.
+    with socket.create_connection(("127.0.0.1", HTTPD.server_port)) as c:
+        c.sendall(payload)
+        c.settimeout(wait)
+        buf = b""
+        try:
+            while True:
+                d = c.recv(65536)
+                if not d:
+                    return buf, True
+                buf += d
+        except socket.timeout:
+            return buf, False
+
+
+class RequestBodyTest(unittest.TestCase):
+    def test_negative_content_length_unauthenticated(self):
+        out, closed = exchange(b"POST /v1/boards HTTP/1.1\r\nHost: x\r\nContent-Length: -1\r\n\r\n")
+        self.assertTrue(out.startswith(b"HTTP/1.1 401 "))
+        self.assertIn(b"Connection: close\r\n", out)
+        self.assertTrue(closed)
+
+    def test_negative_content_length_authenticated(self):
+        out, closed = exchange(
+            b"POST /v1/boards HTTP/1.1\r\nHost: x\r\nAuthorization: Bearer alice\r\nContent-Length: -1\r\n\r\n"
+        )
+        self.assertTrue(out.startswith(b"HTTP/1.1 400 "))
+        self.assertTrue(closed)
+
+    def test_negative_content_length_probe(self):
+        out, closed = exchange(b"GET /v1/health HTTP/1.1\r\nHost: x\r\nContent-Length: -1\r\n\r\n")
+        self.assertTrue(out.startswith(b"HTTP/1.1 200 "))
+        self.assertTrue(closed)
+
+    def test_chunked_body_is_not_parsed_as_next_request(self):
+        chunked = b"Transfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n0\r\n\r\n"
+        next_request = b"GET /v1/health HTTP/1.1\r\nHost: x\r\n\r\n"
+        for head in (
+            b"POST /v1/boards HTTP/1.1\r\nHost: x\r\n",
+            b"POST /v1/boards HTTP/1.1\r\nHost: x\r\nAuthorization: Bearer alice\r\n",
+            b"GET /v1/health HTTP/1.1\r\nHost: x\r\n",
+        ):
+            with self.subTest(head=head):
+                out, closed = exchange(head + chunked + next_request)
+                self.assertEqual(out.count(b"HTTP/1.1 "), 1)
+                self.assertNotIn(b"Error response", out)
+                self.assertTrue(closed)
+
+    def test_body_drained_on_keep_alive(self):
+        body = b'{"name":"x"}'
+        out, closed = exchange(
+            b"POST /v1/boards HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n" % len(body)
+            + body
+            + b"GET /v1/health HTTP/1.1\r\nHost: x\r\n\r\n",
+            wait=0.5,
+        )
+        self.assertEqual(out.count(b"HTTP/1.1 "), 2)
+        self.assertFalse(closed)
+
+
+class PrebuiltResponseTest(unittest.TestCase):
+    def test_probe_has_date_and_stays_open(self):
+        for path in (b"/v1/health", b"/v1/version"):
+            with self.subTest(path=path):
+                out, closed = exchange(b"GET %s HTTP/1.1\r\nHost: x\r\n\r\n" % path, wait=0.5)
+                self.assertTrue(out.startswith(b"HTTP/1.1 200 "))
+                self.assertRegex(out, rb"\r\nDate: \w{3}, \d\d \w{3} \d{4} \d\d:\d\d:\d\d GMT\r\n")
+                self.assertNotIn(b"Connection:", out)
+                self.assertFalse(closed)
+
+    def test_probe_announces_close(self):
+        out, closed = exchange(b"GET /v1/health HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        self.assertIn(b"\r\nDate: ", out)
+        self.assertIn(b"\r\nConnection: close\r\n", out)
+        self.assertTrue(closed)
+
+    def test_no_content_has_date(self):
+        st, b, _ = request("POST", "/v1/boards", body={"name": "204"})
+        st, _, r = request("DELETE", f"/v1/boards/{b['id']}", headers={"If-Match": '"1"'})
+        self.assertEqual(st, 204)
+        self.assertIsNotNone(r.getheader("Date"))
+
+
+class BoardETagTest(unittest.TestCase):
+    def test_get_etag_round_trips_as_if_match(self):
+        st, b, _ = request("POST", "/v1/boards", body={"name": "etag"})
+        self.assertEqual(st, 201)
+        path = f"/v1/boards/{b['id']}"
+        st, _, r = request("GET", path)
+        etag = r.getheader("ETag")
+        self.assertEqual(st, 200)
+
+        st, b, _ = request("PATCH", path, body={"name": "renamed"}, headers={"If-Match": etag})
+        self.assertEqual(st, 200)
+        self.assertEqual(b["name"], "renamed")
+        st, _, _ = request("PATCH", path, body={"name": "again"}, headers={"If-Match": etag})
+        self.assertEqual(st, 412)
+        st, _, _ = request("DELETE", path, headers={"If-Match": etag})
+        self.assertEqual(st, 412)
+
+        st, _, r = request("GET", path)
+        st, _, _ = request("DELETE", path, headers={"If-Match": r.getheader("ETag")})
+        self.assertEqual(st, 204)
+
+
+class PatchPrecedenceTest(unittest.TestCase):
+    # 404, then 412, then 422: an invalid body never hides a missing row or a stale If-Match.
+    def setUp(self):
+        st, b, _ = request("POST", "/v1/boards", body={"name": "precedence"})
+        self.board = f"/v1/boards/{b['id']}"
+        st, col, _ = request("POST", f"{self.board}/columns", body={"name": "c"})
+        self.column = f"{self.board}/columns/{col['id']}"
+        st, card, _ = request("POST", f"{self.column}/cards", body={"title": "t"})
+        self.card = f"{self.column}/cards/{card['id']}"
+        self.missing = "00000000-0000-4000-8000-000000000000"
+
+    def check(self, path, body, if_match, status):
+        st, _, _ = request("PATCH", path, body=body, headers={"If-Match": if_match})
+        self.assertEqual(st, status)
+
+    def test_column(self):
+        bad = {"name": "x" * 81}
+        self.check(f"{self.board}/columns/{self.missing}", bad, '"1"', 404)
+        self.check(self.column, bad, '"9"', 412)
+        self.check(self.column, {"name": "   "}, '"9"', 412)
+        self.check(self.column, bad, '"1"', 422)
+        self.check(self.column, {"name": "ok"}, '"1"', 200)
+
+    def test_card(self):
+        for field, bad in (
+            ("title", {"title": "x" * 201, "description": None}),
+            ("description", {"title": "t", "description": "x" * 8001}),
+        ):
+            with self.subTest(field=field):
+                self.check(f"{self.column}/cards/{self.missing}", bad, '"1"', 404)
+                self.check(self.card, bad, '"9"', 412)
+                self.check(self.card, bad, '"1"', 422)
+        self.check(self.card, {"title": "ok", "description": None}, '"1"', 200)
+
+
+class BoardViewGzipTest(unittest.TestCase):
+    def test_cached_view_served_plain_and_gzipped(self):
+        st, b, _ = request("POST", "/v1/boards", body={"name": "gzip", "description": "x" * 2000})
+        path = f"/v1/boards/{b['id']}"
+        views = []
+        # Miss then hits, in both encodings and both fill orders.
+        for accept in ("gzip", "gzip", "identity", "identity", "gzip"):
+            st, view, r = request("GET", path, headers={"Accept-Encoding": accept})
+            self.assertEqual(st, 200)
+            self.assertEqual(r.getheader("Content-Encoding"), "gzip" if accept == "gzip" else None)
+            views.append(view)
+        self.assertTrue(all(v == views[0] for v in views))
+        self.assertEqual(views[0]["board"]["description"], "x" * 2000)
+
+    def test_gzip_refused_with_zero_qvalue(self):
+        st, b, _ = request("POST", "/v1/boards", body={"name": "q0", "description": "x" * 2000})
+        path = f"/v1/boards/{b['id']}"
+        for accept, encoding in (
+            ("gzip;q=0", None),
+            ("deflate, gzip; q=0.000", None),
+            ("*;q=0", None),
+            ("gzip;q=0.5", "gzip"),
+            ("br, *", "gzip"),
+        ):
+            with self.subTest(accept=accept):
+                st, view, r = request("GET", path, headers={"Accept-Encoding": accept})
+                self.assertEqual(st, 200)
+                self.assertEqual(r.getheader("Content-Encoding"), encoding)
+                self.assertEqual(view["board"]["id"], b["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()